@@ -15,4 +15,11 @@ MAX_COMMENTS = 1000
 
 # Database Configuration
 DATABASE_URL = os.getenv('DATABASE_URL') or 'sqlite:///youtube_sentiment.db'
-SECRET_KEY = os.getenv('SECRET_KEY') or 'your-secret-key-here-change-in-production'
\ No newline at end of file
+SECRET_KEY = os.getenv('SECRET_KEY') or 'your-secret-key-here-change-in-production'
+
+# Translation cache (SQLite file keyed by text hash)
+TRANSLATION_CACHE_PATH = os.getenv('TRANSLATION_CACHE_PATH') or 'translation_cache.db'
+
+
+# Optional fastText language ID model (e.g. lid.176.ftz); used when fasttext is installed
+FASTTEXT_LID_MODEL_PATH = os.getenv('FASTTEXT_LID_MODEL_PATH')
@@ -5,7 +5,7 @@ import os
 import sys
 from youtube_sentiment.models import db, User
 from youtube_sentiment.app import create_app
-from werkzeug.security import generate_password_hash
+from youtube_sentiment.auth import hash_password
 
 def init_db():
     """Initialize the database and create tables"""
@@ -15,6 +15,11 @@ def init_db():
     with app.app_context():
         # Create all tables
         db.create_all()
+        
+        # create_all() skips indexes on tables that already exist
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=db.engine, checkfirst=True)
         print("Database tables created successfully!")
         
         # Check if admin user exists, create if not
@@ -23,7 +28,7 @@ def init_db():
             admin_user = User(
                 username='admin',  # type: ignore[reportCallIssue]
                 email='admin@example.com',  # type: ignore[reportCallIssue]
-                password_hash=generate_password_hash('admin123'),  # type: ignore[reportCallIssue]
+                password_hash=hash_password('admin123'),  # type: ignore[reportCallIssue]
                 is_active=True  # type: ignore[reportCallIssue]
             )
             db.session.add(admin_user)  # type: ignore[reportAttributeAccessIssue]
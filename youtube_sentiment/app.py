@@ -3,10 +3,20 @@ Main Flask application for YouTube Sentiment Analysis
 """
 import os
 import sys
-from flask import Flask, render_template, redirect, url_for, request, flash, jsonify
+from flask import Flask, render_template, redirect, url_for, request, flash, jsonify, current_app
+from flask.json.provider import JSONProvider
 from flask_login import LoginManager, login_required, current_user
 from flask_migrate import Migrate
+from sqlalchemy import event, insert
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+from cachetools import TTLCache
 import json
+import heapq
+import orjson
+from collections import Counter
+from functools import lru_cache
+from itertools import count, islice
 from typing import Any
 
 # Add the parent directory to the path
@@ -15,39 +25,146 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 # Import our modules
 from youtube_sentiment.models import db, User, SearchHistory, LoginHistory, CommentAnalysis
 from youtube_sentiment.auth import auth
-from youtube_sentiment.youtube_api import get_video_id
+from youtube_sentiment.youtube_api import get_video_id, fetch_comments, iter_all_comments
+from youtube_sentiment.language_processor import detect_language_batch, translate_to_english_batch
+from youtube_sentiment.sentiment_analyzer import analyze_sentiment_batch, detect_toxicity_batch, load_sentiment_lexicon
+from youtube_sentiment.chatbot import initialize_chatbot, ask_question_async
+
+# Number of comments analyzed per chunk in api_analyze
+ANALYZE_CHUNK_SIZE = 500
+
+# Number of processed comments stored per search
+SAVED_COMMENTS_LIMIT = 50
+
+# Number of top positive/negative comments returned to the dashboard
+TOP_COMMENTS_LIMIT = 5
+
+def _set_sqlite_pragma(dbapi_connection, connection_record):
+    """Tune each new SQLite connection for the write-heavy analysis workload"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA cache_size=-64000")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
+
+class ORJSONProvider(JSONProvider):
+    """JSON provider that serializes responses with orjson"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+def process_comment_chunk(comments):
+    """
+    Run a chunk of comments through language detection, translation,
+    sentiment analysis and toxicity detection
+    
+    Args:
+        comments (list): Comment dictionaries as returned by the YouTube API module
+        
+    Returns:
+        list: Processed comments with all analysis results
+    """
+    texts = [comment['text'] for comment in comments]
+    
+    # Detect languages
+    languages = detect_language_batch(texts)
+    
+    # Translate only the comments that are not English
+    translated_texts = list(texts)
+    to_translate = [i for i, lang in enumerate(languages) if lang not in ('en', 'unknown')]
+    for i, translated in zip(to_translate, translate_to_english_batch([texts[i] for i in to_translate])):
+        translated_texts[i] = translated
+    
+    # Perform sentiment analysis and toxicity detection
+    sentiment_results = analyze_sentiment_batch(translated_texts)
+    toxicity_results = detect_toxicity_batch(translated_texts)
+    
+    # Combine all results
+    return [
+        {
+            **comment,
+            'original_language': original_language,
+            'translated_text': translated_text,
+            'sentiment': sentiment_result['sentiment'],
+            'polarity': sentiment_result['polarity'],
+            'is_toxic': is_toxic
+        }
+        for comment, original_language, translated_text, sentiment_result, is_toxic
+        in zip(comments, languages, translated_texts, sentiment_results, toxicity_results)
+    ]
 
 def create_app():
     """Create and configure the Flask application"""
     app = Flask(__name__)
+    app.json = ORJSONProvider(app)
     
     # Load configuration
     app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'your-secret-key-change-in-production')
     app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///youtube_sentiment.db')
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
     
+    database_url = make_url(app.config['SQLALCHEMY_DATABASE_URI'])
+    is_sqlite = database_url.get_backend_name() == 'sqlite'
+    if is_sqlite and database_url.database not in (None, '', ':memory:'):
+        # Keep long-lived connections so per-connection pragmas and page cache are reused
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+            'poolclass': QueuePool,
+            'pool_size': 10,
+            'pool_pre_ping': True,
+            'connect_args': {'check_same_thread': False}
+        }
+    elif not is_sqlite:
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {'pool_pre_ping': True, 'pool_size': 10}
+    
     # Initialize extensions
     db.init_app(app)
+    if is_sqlite:
+        with app.app_context():
+            event.listen(db.engine, 'connect', _set_sqlite_pragma)
     migrate = Migrate(app, db)
     
+    # Initialize the chatbot model once instead of on every request
+    app.extensions['gemini_model'] = initialize_chatbot(None)
+    
+    # Parse the sentiment lexicon before any worker processes are forked
+    load_sentiment_lexicon()
+    
     # Initialize Flask-Login
     login_manager = LoginManager()
     login_manager.init_app(app)
     login_manager.login_view = 'auth.login'  # type: ignore
     login_manager.login_message = 'Please log in to access this page.'
     
+    # Cache loaded users briefly so authenticated requests skip the user SELECT
+    user_cache = TTLCache(maxsize=1024, ttl=60)
+    app.extensions['user_cache'] = user_cache
+    
     @login_manager.user_loader
     def load_user(user_id):
-        return User.query.get(int(user_id))
+        user = user_cache.get(user_id)
+        if user is None:
+            user = User.query.get(int(user_id))
+            if user is None:
+                return None
+            # Keep a detached copy in the cache and attach a fresh instance per request
+            db.session.expunge(user)  # type: ignore
+            user_cache[user_id] = user
+        return db.session.merge(user, load=False)  # type: ignore
     
     # Register blueprints
     app.register_blueprint(auth, url_prefix='/auth')
     
     # Custom filter for JSON parsing in templates
+    # History pages render the same stored JSON strings repeatedly, so memoize the parse
     @app.template_filter('from_json')
+    @lru_cache(maxsize=1024)
     def from_json_filter(value):
         try:
-            return json.loads(value)
+            return orjson.loads(value)
         except:
             return {}
     
@@ -76,96 +193,98 @@ def create_app():
             return jsonify({'error': 'YouTube URL is required'}), 400
         
         try:
-            # Import analysis functions here to avoid circular imports
-            from youtube_sentiment.youtube_api import fetch_comments, fetch_all_comments
-            from youtube_sentiment.language_processor import detect_language, translate_to_english
-            from youtube_sentiment.sentiment_analyzer import analyze_sentiment, detect_toxicity
-            
-            # Fetch comments
+            # Fetch comments lazily so that large videos are processed chunk by chunk
             if fetch_all:
-                comments = fetch_all_comments(youtube_url)
+                comments = iter_all_comments(youtube_url)
             else:
-                comments = fetch_comments(youtube_url, max_comments)
+                comments = iter(fetch_comments(youtube_url, max_comments))
             
-            # Process comments
-            processed_comments = []
-            for comment in comments:
-                # Detect language
-                original_language = detect_language(comment['text'])
-                
-                # Translate if not English
-                if original_language != 'en':
-                    translated_text = translate_to_english(comment['text'])
-                else:
-                    translated_text = comment['text']
-                
-                # Perform sentiment analysis
-                sentiment_result = analyze_sentiment(translated_text)
-                
-                # Detect toxicity
-                is_toxic = detect_toxicity(translated_text)
-                
-                # Combine all results
-                processed_comment = {
-                    **comment,
-                    'original_language': original_language,
-                    'translated_text': translated_text,
-                    'sentiment': sentiment_result['sentiment'],
-                    'polarity': sentiment_result['polarity'],
-                    'is_toxic': is_toxic
-                }
+            total_comments = 0
+            sentiment_distribution = Counter()
+            language_distribution = Counter()
+            sample_comments = {'positive': [], 'negative': [], 'neutral': []}
+            saved_comments = []
+            # Min-heaps of (key, -position, comment) holding the strongest comments seen so far;
+            # on equal keys the earlier comment wins, matching a stable sort
+            top_positive = []
+            top_negative = []
+            tiebreaker = count()
+            
+            while True:
+                chunk = list(islice(comments, ANALYZE_CHUNK_SIZE))
+                if not chunk:
+                    break
                 
-                processed_comments.append(processed_comment)
+                # Aggregate summary statistics as each chunk is processed
+                for comment in process_comment_chunk(chunk):
+                    sentiment = comment['sentiment']
+                    total_comments += 1
+                    sentiment_distribution[sentiment] += 1
+                    language_distribution[comment['original_language']] += 1
+                    samples = sample_comments[sentiment.lower()]
+                    if len(samples) < 5:
+                        samples.append(comment['text'])
+                    
+                    if sentiment == 'Positive':
+                        heap, key = top_positive, comment['polarity']
+                    elif sentiment == 'Negative':
+                        heap, key = top_negative, -comment['polarity']
+                    else:
+                        heap = None
+                    if heap is not None:
+                        entry = (key, -next(tiebreaker), comment)
+                        if len(heap) < TOP_COMMENTS_LIMIT:
+                            heapq.heappush(heap, entry)
+                        else:
+                            heapq.heappushpop(heap, entry)
+                    
+                    if len(saved_comments) < SAVED_COMMENTS_LIMIT:
+                        saved_comments.append(comment)
             
-            # Calculate summary statistics
-            sentiments = [comment['sentiment'] for comment in processed_comments]
-            languages = [comment['original_language'] for comment in processed_comments]
-            from collections import Counter
-            sentiment_distribution = dict(Counter(sentiments))
-            language_distribution = dict(Counter(languages))
+            sentiment_distribution = dict(sentiment_distribution)
+            language_distribution = dict(language_distribution)
             
             # Save to database
             video_id = get_video_id(youtube_url)
             if video_id:
-                # Create search history record
-                search_history = SearchHistory(
+                # Create search history record in a single INSERT and get its id back
+                result = db.session.execute(insert(SearchHistory).values(  # type: ignore
                     user_id=current_user.id,
                     youtube_url=youtube_url,
                     video_id=video_id,
-                    total_comments=len(processed_comments),
-                    sentiment_distribution=json.dumps(sentiment_distribution),
-                    language_distribution=json.dumps(language_distribution)
-                )
-                db.session.add(search_history)  # type: ignore
-                db.session.commit()  # type: ignore
+                    total_comments=total_comments,
+                    sentiment_distribution=orjson.dumps(sentiment_distribution).decode(),
+                    language_distribution=orjson.dumps(language_distribution).decode()
+                ))
+                search_id = result.inserted_primary_key[0]
                 
-                # Save individual comments (limit to first 50 for performance)
-                for comment in processed_comments[:50]:
-                    comment_analysis = CommentAnalysis(
-                        search_id=search_history.id,
-                        comment_id=comment['id'],
-                        author=comment['author'],
-                        text=comment['text'],
-                        original_language=comment['original_language'],
-                        sentiment=comment['sentiment'],
-                        polarity=comment['polarity'],
-                        is_toxic=comment['is_toxic']
-                    )
-                    db.session.add(comment_analysis)  # type: ignore
+                # Save individual comments (limit to the first few for performance)
+                mappings = [
+                    {
+                        'search_id': search_id,
+                        'comment_id': comment['id'],
+                        'author': comment['author'],
+                        'text': comment['text'],
+                        'original_language': comment['original_language'],
+                        'sentiment': comment['sentiment'],
+                        'polarity': comment['polarity'],
+                        'is_toxic': comment['is_toxic']
+                    }
+                    for comment in saved_comments
+                ]
+                if mappings:
+                    db.session.execute(insert(CommentAnalysis), mappings)  # type: ignore
                 
                 db.session.commit()  # type: ignore
             
             return jsonify({
                 'success': True,
-                'comments': processed_comments,
-                'total_comments': len(processed_comments),
+                'total_comments': total_comments,
                 'sentiment_distribution': sentiment_distribution,
                 'language_distribution': language_distribution,
-                'sample_comments': {
-                    'positive': [c['text'] for c in processed_comments if c['sentiment'] == 'Positive'][:5],
-                    'negative': [c['text'] for c in processed_comments if c['sentiment'] == 'Negative'][:5],
-                    'neutral': [c['text'] for c in processed_comments if c['sentiment'] == 'Neutral'][:5]
-                }
+                'sample_comments': sample_comments,
+                'top_positive': [entry[2] for entry in sorted(top_positive, reverse=True)],
+                'top_negative': [entry[2] for entry in sorted(top_negative, reverse=True)]
             })
             
         except Exception as e:
@@ -173,7 +292,7 @@ def create_app():
     
     @app.route('/api/chatbot', methods=['POST'])
     @login_required
-    def api_chatbot():
+    async def api_chatbot():
         """API endpoint for chatbot interactions"""
         data = request.get_json()
         question = data.get('question')
@@ -183,11 +302,8 @@ def create_app():
             return jsonify({'error': 'Question is required'}), 400
         
         try:
-            # Import chatbot functions
-            from youtube_sentiment.chatbot import initialize_chatbot, ask_question
-            
-            # Initialize chatbot with None to let it choose the best available model
-            model = initialize_chatbot(None)
+            # Model is initialized once in create_app
+            model = current_app.extensions.get('gemini_model')
             if not model:
                 return jsonify({'error': 'Chatbot not available. Please check your API configuration.'}), 500
             
@@ -196,7 +312,7 @@ def create_app():
             context_data = context
             
             # Ask question
-            response = ask_question(model, question, context_data)
+            response = await ask_question_async(model, question, context_data)
             return jsonify({'response': response})
             
         except Exception as e:
@@ -1,14 +1,50 @@
 """
 Authentication module for YouTube Sentiment Analysis application
 """
-from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify
+from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify, current_app
 from flask_login import login_user, logout_user, login_required, current_user
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.security import check_password_hash
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHash
 from .models import db, User, LoginHistory, SearchHistory
 from datetime import datetime
 
 auth = Blueprint('auth', __name__)
 
+# Argon2id with parameters tuned to keep a login verification well under 50ms
+password_hasher = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
+
+# Prefixes of hashes created by werkzeug.security before the switch to Argon2
+LEGACY_HASH_PREFIXES = ('pbkdf2:', 'scrypt:')
+
+def hash_password(password):
+    """Hash a password for storage"""
+    return password_hasher.hash(password)
+
+def verify_password(user, password):
+    """
+    Check a password against the user's stored hash.
+    
+    Legacy Werkzeug hashes and Argon2 hashes with outdated parameters are
+    upgraded in place on success; the caller is responsible for committing.
+    """
+    stored_hash = user.password_hash
+    
+    if stored_hash.startswith(LEGACY_HASH_PREFIXES):
+        if not check_password_hash(stored_hash, password):
+            return False
+        user.password_hash = hash_password(password)
+        return True
+    
+    try:
+        password_hasher.verify(stored_hash, password)
+    except (VerificationError, InvalidHash):
+        return False
+    
+    if password_hasher.check_needs_rehash(stored_hash):
+        user.password_hash = hash_password(password)
+    return True
+
 @auth.route('/login', methods=['GET', 'POST'])
 def login():
     if request.method == 'POST':
@@ -22,20 +58,17 @@ def login():
         
         user = User.query.filter_by(username=username).first()
         
-        if user and check_password_hash(user.password_hash, password):
+        if user and verify_password(user, password):
             login_user(user, remember=remember)
             
-            # Record login history
+            # Record login history and update last login time in one transaction
             login_record = LoginHistory(
                 user_id=user.id,
                 ip_address=request.environ.get('HTTP_X_REAL_IP', request.remote_addr),
                 user_agent=request.headers.get('User-Agent')
             )
-            db.session.add(login_record)  # type: ignore[reportAttributeAccessIssue]
-            db.session.commit()  # type: ignore[reportAttributeAccessIssue]
-            
-            # Update last login time
             user.last_login = datetime.utcnow()
+            db.session.add(login_record)  # type: ignore[reportAttributeAccessIssue]
             db.session.commit()  # type: ignore[reportAttributeAccessIssue]
             
             next_page = request.args.get('next')
@@ -79,7 +112,7 @@ def register():
         new_user = User(
             username=username,  # type: ignore[reportAttributeAccessIssue]
             email=email,  # type: ignore[reportAttributeAccessIssue]
-            password_hash=generate_password_hash(password)  # type: ignore[reportAttributeAccessIssue]
+            password_hash=hash_password(password)  # type: ignore[reportAttributeAccessIssue]
         )  # type: ignore[reportGeneralTypeIssues]
         
         db.session.add(new_user)  # type: ignore[reportAttributeAccessIssue]
@@ -93,6 +126,7 @@ def register():
 @auth.route('/logout')
 @login_required
 def logout():
+    current_app.extensions['user_cache'].pop(str(current_user.id), None)
     logout_user()
     flash('You have been logged out successfully', 'info')
     return redirect(url_for('auth.login'))
@@ -106,5 +140,5 @@ def profile():
 @login_required
 def history():
     searches = SearchHistory.query.filter_by(user_id=current_user.id).order_by(
-        SearchHistory.created_at.desc()).all()
+        SearchHistory.created_at.desc()).limit(50).all()
     return render_template('history.html', searches=searches)
\ No newline at end of file
@@ -3,6 +3,10 @@ Module for Gemini-powered chatbot
 """
 import sys
 import os
+import hashlib
+import threading
+from functools import lru_cache
+from cachetools import LRUCache
 
 # Add the parent directory to the path to allow imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -36,9 +40,10 @@ except ImportError:
 if GEMINI_AVAILABLE and GEMINI_API_KEY and configure:
     configure(api_key=GEMINI_API_KEY)
 
+@lru_cache(maxsize=1)
 def list_available_models():
     """
-    List available Gemini models
+    List available Gemini models (cached after the first call)
     
     Returns:
         list: List of available model names
@@ -60,6 +65,38 @@ def list_available_models():
         # Return common model names as fallback
         return ['models/gemini-1.5-flash', 'models/gemini-1.5-pro']
 
+@lru_cache(maxsize=1)
+def select_default_model():
+    """
+    Choose the preferred Gemini model among the available ones (cached after the first call)
+    
+    Returns:
+        str: Model name
+    """
+    model_name = None
+    available_models = list_available_models()
+    # Try common models in order of preference (with correct naming)
+    preferred_models = [
+        'models/gemini-1.5-flash', 
+        'models/gemini-1.5-pro',
+        'models/gemini-flash-latest',
+        'models/gemini-pro-latest',
+        'gemini-1.5-flash', 
+        'gemini-1.5-pro', 
+        'gemini-pro'
+    ]
+    for model in preferred_models:
+        if model in available_models or not available_models:
+            model_name = model
+            break
+    # If still no model found, use the first available
+    if not model_name and available_models:
+        model_name = available_models[0]
+    # Fallback to latest models
+    if not model_name:
+        model_name = 'models/gemini-flash-latest'
+    return model_name
+
 def initialize_chatbot(model_name=None):
     """
     Initialize the Gemini model for chatbot functionality
@@ -78,29 +115,9 @@ def initialize_chatbot(model_name=None):
         print("Warning: GEMINI_API_KEY not found. Chatbot functionality will be disabled.")
         return None
     
-    # If no model specified, try to find an appropriate one
+    # If no model specified, use the preferred available one
     if not model_name:
-        available_models = list_available_models()
-        # Try common models in order of preference (with correct naming)
-        preferred_models = [
-            'models/gemini-1.5-flash', 
-            'models/gemini-1.5-pro',
-            'models/gemini-flash-latest',
-            'models/gemini-pro-latest',
-            'gemini-1.5-flash', 
-            'gemini-1.5-pro', 
-            'gemini-pro'
-        ]
-        for model in preferred_models:
-            if model in available_models or not available_models:
-                model_name = model
-                break
-        # If still no model found, use the first available
-        if not model_name and available_models:
-            model_name = available_models[0]
-        # Fallback to latest models
-        if not model_name:
-            model_name = 'models/gemini-flash-latest'
+        model_name = select_default_model()
     
     try:
         model = GenerativeModel(model_name)
@@ -125,6 +142,85 @@ def initialize_chatbot(model_name=None):
         print(f"Error initializing Gemini model '{model_name}': {str(e)}")
         return None
 
+# Prompt sections wrapped around the sample comments when analysis context is available
+CONTEXT_PROMPT_HEADER = """
+You are an AI assistant analyzing YouTube comment sentiment data. 
+Based on the following analysis data, answer the question at the end.
+
+=== ANALYSIS DATA ===
+Total Comments Analyzed: {total_comments}
+
+Sentiment Distribution: 
+{sentiment_distribution}
+
+Language Distribution: 
+{language_distribution}
+
+Sample Comments by Sentiment:
+"""
+
+CONTEXT_PROMPT_FOOTER = """
+=== QUESTION ===
+{question}
+
+=== INSTRUCTIONS ===
+Provide a concise and helpful response based on the data when relevant. 
+When discussing what people are talking about, reference the sample comments 
+to provide specific insights about the topics and themes in the comments.
+Keep your response under 200 words.
+"""
+
+def build_prompt(question, context_data=None):
+    """
+    Build the chatbot prompt for a question with optional context
+    
+    Args:
+        question (str): Question to ask
+        context_data (dict, optional): Context data from sentiment analysis
+        
+    Returns:
+        str: Prompt to send to the model
+    """
+    if not context_data:
+        return question
+    
+    # Collect the pieces and join once instead of growing a string in the loop
+    parts = [CONTEXT_PROMPT_HEADER.format_map({
+        'total_comments': context_data.get('total_comments', 0),
+        'sentiment_distribution': context_data.get('sentiment_distribution', {}),
+        'language_distribution': context_data.get('language_distribution', {})
+    })]
+    
+    # Add sample comments if available
+    sample_comments = context_data.get('sample_comments', {})
+    if sample_comments:
+        for sentiment, comments in sample_comments.items():
+            if comments:
+                parts.append(f"\n{sentiment.capitalize()} Comments:\n")
+                parts.extend(f"  {i}. {comment}\n" for i, comment in enumerate(comments, 1))
+    
+    parts.append(CONTEXT_PROMPT_FOOTER.format_map({'question': question}))
+    return ''.join(parts)
+
+# Answers to repeated questions about the same analysis (cachetools caches are not thread-safe)
+_response_cache = LRUCache(maxsize=256)
+_response_cache_lock = threading.Lock()
+
+def _response_cache_key(model, prompt):
+    """Build the response cache key for a model and prompt"""
+    digest = hashlib.blake2b(prompt.encode('utf-8'), digest_size=16).hexdigest()
+    return (getattr(model, 'model_name', None), digest)
+
+def _get_cached_response(key):
+    """Return the cached answer for a key, or None"""
+    with _response_cache_lock:
+        return _response_cache.get(key)
+
+def _store_response(key, text):
+    """Cache a successful answer"""
+    with _response_cache_lock:
+        _response_cache[key] = text
+
 def ask_question(model, question, context_data=None):
     """
     Ask a question to the chatbot with optional context
@@ -141,48 +237,41 @@ def ask_question(model, question, context_data=None):
         return "Chatbot is not available. Please check your API configuration."
     
     try:
-        # Create prompt with context if available
-        if context_data:
-            # Build a more comprehensive prompt with sample comments
-            prompt = f"""
-            You are an AI assistant analyzing YouTube comment sentiment data. 
-            Based on the following analysis data, answer the question at the end.
-            
-            === ANALYSIS DATA ===
-            Total Comments Analyzed: {context_data.get('total_comments', 0)}
-            
-            Sentiment Distribution: 
-            {context_data.get('sentiment_distribution', {})}
-            
-            Language Distribution: 
-            {context_data.get('language_distribution', {})}
-            
-            Sample Comments by Sentiment:
-            """
-            
-            # Add sample comments if available
-            sample_comments = context_data.get('sample_comments', {})
-            if sample_comments:
-                for sentiment, comments in sample_comments.items():
-                    if comments:
-                        prompt += f"\n{sentiment.capitalize()} Comments:\n"
-                        for i, comment in enumerate(comments, 1):
-                            prompt += f"  {i}. {comment}\n"
-            
-            prompt += f"""
-            === QUESTION ===
-            {question}
-            
-            === INSTRUCTIONS ===
-            Provide a concise and helpful response based on the data when relevant. 
-            When discussing what people are talking about, reference the sample comments 
-            to provide specific insights about the topics and themes in the comments.
-            Keep your response under 200 words.
-            """
-        else:
-            prompt = question
-            
+        # The prompt embeds the question and the analysis summary, so it identifies the answer
+        prompt = build_prompt(question.strip(), context_data)
+        key = _response_cache_key(model, prompt)
+        cached = _get_cached_response(key)
+        if cached is not None:
+            return cached
         response = model.generate_content(prompt)
+        _store_response(key, response.text)
+        return response.text
+    except Exception as e:
+        return f"Sorry, I encountered an error while processing your question: {str(e)}"
+
+async def ask_question_async(model, question, context_data=None):
+    """
+    Ask a question to the chatbot without blocking the event loop
+    
+    Args:
+        model (GenerativeModel): Initialized Gemini model
+        question (str): Question to ask
+        context_data (dict, optional): Context data from sentiment analysis
+        
+    Returns:
+        str: Response from the chatbot
+    """
+    if not model:
+        return "Chatbot is not available. Please check your API configuration."
+    
+    try:
+        prompt = build_prompt(question.strip(), context_data)
+        key = _response_cache_key(model, prompt)
+        cached = _get_cached_response(key)
+        if cached is not None:
+            return cached
+        response = await model.generate_content_async(prompt)
+        _store_response(key, response.text)
         return response.text
     except Exception as e:
         return f"Sorry, I encountered an error while processing your question: {str(e)}"
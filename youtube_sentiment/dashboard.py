@@ -1,6 +1,7 @@
 """
 Module for creating dashboard visualizations
 """
+import heapq
 from collections import Counter
 
 def create_sentiment_chart(sentiment_data):
@@ -74,15 +75,13 @@ def get_top_comments(comments_data, sentiment, top_n=5):
         list: Top N comments with highest polarity scores
     """
     # Filter comments by sentiment
-    filtered_comments = [comment for comment in comments_data if comment['sentiment'] == sentiment]
+    filtered_comments = (comment for comment in comments_data if comment['sentiment'] == sentiment)
     
-    # Sort by polarity score (absolute value for negative sentiment)
+    # Select by polarity score (lowest first for negative sentiment) without a full sort
     if sentiment == 'Positive':
-        sorted_comments = sorted(filtered_comments, key=lambda x: x['polarity'], reverse=True)
+        return heapq.nlargest(top_n, filtered_comments, key=lambda x: x['polarity'])
     else:  # Negative
-        sorted_comments = sorted(filtered_comments, key=lambda x: x['polarity'])
-    
-    return sorted_comments[:top_n]
+        return heapq.nsmallest(top_n, filtered_comments, key=lambda x: x['polarity'])
 
 def create_dashboard(processed_comments):
     """
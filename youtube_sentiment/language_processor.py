@@ -2,24 +2,205 @@
 Module for language detection and translation (fixed with input sanitization)
 """
 
+import hashlib
 import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from cachetools import LRUCache
 from langdetect import detect, DetectorFactory
 from deep_translator import GoogleTranslator
 
+# Google's compact language detector is much faster than langdetect; use it when installed
+try:
+    import gcld3
+    CLD3_AVAILABLE = True
+except ImportError:
+    gcld3 = None
+    CLD3_AVAILABLE = False
+
+# fastText's compressed language ID model classifies a whole batch in one call
+try:
+    import fasttext
+    FASTTEXT_AVAILABLE = True
+except ImportError:
+    fasttext = None
+    FASTTEXT_AVAILABLE = False
+
+# Add the parent directory to the path to allow imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Import config properly
+try:
+    from config import TRANSLATION_CACHE_PATH, FASTTEXT_LID_MODEL_PATH
+except ImportError:
+    # If config is unavailable, get from environment variable
+    TRANSLATION_CACHE_PATH = os.getenv('TRANSLATION_CACHE_PATH', 'translation_cache.db')
+    FASTTEXT_LID_MODEL_PATH = os.getenv('FASTTEXT_LID_MODEL_PATH')
+
 # Ensure consistent results from langdetect
 DetectorFactory.seed = 0
 
+# Number of concurrent requests used for batch translation
+TRANSLATION_MAX_WORKERS = 16
+
+# English function words; ASCII text containing two of them is taken as English
+# without running the statistical detector
+_ENGLISH_HINT_WORDS = frozenset({
+    'the', 'and', 'is', 'are', 'was', 'this', 'that', 'you', 'it', 'to', 'of',
+    'for', 'with', 'not', 'my', 'but', 'have', 'what', 'be', 'they', 'just'
+})
+_ASCII_WORD_RE = re.compile(r"[a-z']+")
+
+# Scripts that are only used by a single language (as langdetect labels it)
+_SCRIPT_LANGUAGES = {
+    'HANGUL': 'ko',
+    'HIRAGANA': 'ja',
+    'KATAKANA': 'ja',
+    'THAI': 'th',
+    'GREEK': 'el',
+    'HEBREW': 'he'
+}
+
+# Share of letters that must belong to one script for the script fast path
+_SCRIPT_SHARE = 0.9
+
+# Minimum fastText probability for a prediction to be trusted
+_FASTTEXT_MIN_CONFIDENCE = 0.5
+_FASTTEXT_LABEL_PREFIX = '__label__'
+
+# SQLite allows a limited number of bound parameters per statement
+_CACHE_QUERY_CHUNK = 500
+
+# In-memory tier in front of the SQLite cache (cachetools caches are not thread-safe)
+_memory_cache = LRUCache(maxsize=50_000)
+_memory_cache_lock = threading.Lock()
+
+# One cache connection per thread, since sqlite3 connections are not shareable
+_cache_local = threading.local()
+
+# One translator per thread: GoogleTranslator keeps per-request state on the instance
+_translator_local = threading.local()
+
+# One CLD3 detector per thread, since FindLanguage is not documented as thread-safe
+_cld3_local = threading.local()
+
+
+def _get_cld3_detector():
+    """
+    Get this thread's CLD3 language identifier, creating it if needed.
+    """
+    detector = getattr(_cld3_local, 'detector', None)
+    if detector is None:
+        detector = gcld3.NNetLanguageIdentifier(min_num_bytes=0, max_num_bytes=1000)
+        _cld3_local.detector = detector
+    return detector
+
+@lru_cache(maxsize=None)
+def _get_fasttext_model():
+    """
+    Load the fastText language ID model once, or return None if it is unavailable.
+    """
+    if not FASTTEXT_AVAILABLE or not FASTTEXT_LID_MODEL_PATH:
+        return None
+    try:
+        return fasttext.load_model(FASTTEXT_LID_MODEL_PATH)
+    except Exception as e:
+        logging.warning(f"Could not load fastText model {FASTTEXT_LID_MODEL_PATH}. Error: {str(e)}")
+        return None
+
+def _predict_fasttext(model, texts: list) -> list:
+    """
+    Classify texts with fastText in one call.
+
+    Returns a language code per text, or None where the model is unsure.
+    """
+    # fastText predicts one line at a time, so newlines must not reach it
+    labels, probabilities = model.predict([text.replace('\n', ' ') for text in texts], k=1)
+    return [
+        label[0][len(_FASTTEXT_LABEL_PREFIX):] if probability[0] >= _FASTTEXT_MIN_CONFIDENCE else None
+        for label, probability in zip(labels, probabilities)
+    ]
+
+def _detect_language_fast(text: str):
+    """
+    Cheaply identify unambiguous text from its characters alone.
+
+    Returns None when the statistical detector is needed.
+    """
+    if text.isascii():
+        words = set(_ASCII_WORD_RE.findall(text.lower()))
+        if len(words & _ENGLISH_HINT_WORDS) >= 2:
+            return 'en'
+        return None
+
+    scripts = {}
+    letters = 0
+    for ch in text:
+        if ch.isalpha():
+            letters += 1
+            script = unicodedata.name(ch, '').split(' ', 1)[0]
+            scripts[script] = scripts.get(script, 0) + 1
+    if not letters:
+        return None
+
+    # Japanese mixes kana with kanji (CJK ideographs)
+    kana = scripts.get('HIRAGANA', 0) + scripts.get('KATAKANA', 0)
+    if kana and kana + scripts.get('CJK', 0) >= _SCRIPT_SHARE * letters:
+        return 'ja'
+
+    for script, language in _SCRIPT_LANGUAGES.items():
+        if scripts.get(script, 0) >= _SCRIPT_SHARE * letters:
+            return language
+    return None
+
+
+def _detect_language_precheck(text: str):
+    """
+    Resolve texts that need no statistical detector.
+
+    Returns None when one is needed.
+    """
+    if not text or not text.strip():
+        return 'unknown'
+    # Handle texts with only emojis or symbols
+    if all(not ch.isalnum() for ch in text):
+        return 'unknown'
+    return _detect_language_fast(text)
+
+
+def _detect_language_statistical(text: str) -> str:
+    """
+    Detect the language of a text with CLD3, falling back to langdetect.
+    """
+    if CLD3_AVAILABLE:
+        result = _get_cld3_detector().FindLanguage(text=text)
+        if result.is_reliable:
+            return result.language
+    # Fall back to langdetect when CLD3 is unavailable or unsure
+    return detect(text)
+
+
+@lru_cache(maxsize=100_000)
 def detect_language(text: str) -> str:
     """
     Detect the language of a given text safely.
     """
     try:
-        if not text or not text.strip():
-            return 'unknown'
-        # Handle texts with only emojis or symbols
-        if all(not ch.isalnum() for ch in text):
-            return 'unknown'
-        return detect(text)
+        precheck_language = _detect_language_precheck(text)
+        if precheck_language:
+            return precheck_language
+        model = _get_fasttext_model()
+        if model is not None:
+            fasttext_language = _predict_fasttext(model, [text])[0]
+            if fasttext_language:
+                return fasttext_language
+        return _detect_language_statistical(text)
     except Exception as e:
         logging.warning(
             f"Language detection failed for text: {text[:30]}... Error: {str(e)}"
@@ -27,6 +208,172 @@ def detect_language(text: str) -> str:
         return 'unknown'
 
 
+def detect_language_batch(texts: list) -> list:
+    """
+    Detect the language of each text in a list.
+
+    When the fastText model is loaded, every distinct text that needs the
+    statistical detector is classified in a single predict call.
+    """
+    model = _get_fasttext_model()
+    if model is None:
+        # Detect each distinct text once and fan the result back out
+        detected = {text: detect_language(text) for text in dict.fromkeys(texts)}
+        return [detected[text] for text in texts]
+
+    detected = {}
+    pending = []
+    for text in dict.fromkeys(texts):
+        precheck_language = _detect_language_precheck(text)
+        if precheck_language:
+            detected[text] = precheck_language
+        else:
+            pending.append(text)
+
+    if pending:
+        try:
+            predictions = _predict_fasttext(model, pending)
+        except Exception as e:
+            logging.warning(f"Batch language detection failed. Error: {str(e)}")
+            predictions = [None] * len(pending)
+        for text, language in zip(pending, predictions):
+            # Fall back to CLD3/langdetect where fastText is unsure
+            if not language:
+                try:
+                    language = _detect_language_statistical(text)
+                except Exception as e:
+                    logging.warning(
+                        f"Language detection failed for text: {text[:30]}... Error: {str(e)}"
+                    )
+                    language = 'unknown'
+            detected[text] = language
+
+    return [detected[text] for text in texts]
+
+
+def _cache_key(text: str) -> str:
+    """
+    Build the translation cache key for a text.
+    """
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _cache_connection() -> sqlite3.Connection:
+    """
+    Get this thread's connection to the translation cache, creating it if needed.
+    """
+    conn = getattr(_cache_local, 'conn', None)
+    if conn is None:
+        conn = sqlite3.connect(TRANSLATION_CACHE_PATH)
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS translation_cache '
+            '(hash_key TEXT PRIMARY KEY, translated_text TEXT NOT NULL)'
+        )
+        _cache_local.conn = conn
+    return conn
+
+
+def _get_cached_translations(keys: list) -> dict:
+    """
+    Look up cached translations for a list of cache keys.
+
+    The in-memory LRU tier is checked first; only its misses go to SQLite.
+    """
+    cached = {}
+    with _memory_cache_lock:
+        for key in keys:
+            translated = _memory_cache.get(key)
+            if translated is not None:
+                cached[key] = translated
+
+    remaining = [key for key in dict.fromkeys(keys) if key not in cached]
+    if not remaining:
+        return cached
+
+    persisted = {}
+    try:
+        conn = _cache_connection()
+        for start in range(0, len(remaining), _CACHE_QUERY_CHUNK):
+            chunk = remaining[start:start + _CACHE_QUERY_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            rows = conn.execute(
+                f'SELECT hash_key, translated_text FROM translation_cache WHERE hash_key IN ({placeholders})',
+                chunk
+            )
+            persisted.update(rows)
+    except sqlite3.Error as e:
+        logging.warning(f"Translation cache lookup failed. Error: {str(e)}")
+
+    with _memory_cache_lock:
+        _memory_cache.update(persisted)
+    cached.update(persisted)
+    return cached
+
+
+def _store_translations(translations: dict) -> None:
+    """
+    Store translations keyed by cache key in both cache tiers.
+    """
+    if not translations:
+        return
+    with _memory_cache_lock:
+        _memory_cache.update(translations)
+    try:
+        conn = _cache_connection()
+        with conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO translation_cache (hash_key, translated_text) VALUES (?, ?)',
+                translations.items()
+            )
+    except sqlite3.Error as e:
+        logging.warning(f"Translation cache write failed. Error: {str(e)}")
+
+
+def _get_translator() -> GoogleTranslator:
+    """
+    Get this thread's GoogleTranslator, creating it if needed.
+    """
+    translator = getattr(_translator_local, 'translator', None)
+    if translator is None:
+        translator = GoogleTranslator(source='auto', target='en')
+        _translator_local.translator = translator
+    return translator
+
+
+def _request_translation(text: str):
+    """
+    Translate a single text with deep-translator.
+
+    Returns None if the translation failed.
+    """
+    try:
+        return _get_translator().translate(text)
+    except Exception as e:
+        logging.error(
+            f"Translation failed for text: {text[:30]}... Error: {str(e)}"
+        )
+        return None
+
+
+def _translate(text: str) -> str:
+    """
+    Translate a single text through the cache, falling back to the original.
+    """
+    key = _cache_key(text)
+    cached = _get_cached_translations([key])
+    if key in cached:
+        return cached[key]
+
+    translated = _request_translation(text)
+
+    # deep-translator can sometimes return None
+    if translated is None:
+        return text  # Return original if translation fails
+
+    _store_translations({key: translated})
+    return translated
+
+
 def translate_to_english(text: str, src_lang: str = None) -> str:
     """
     Translate text to English safely.
@@ -44,16 +391,36 @@ def translate_to_english(text: str, src_lang: str = None) -> str:
             return text
 
         # Use deep-translator
-        translated = GoogleTranslator(source='auto', target='en').translate(text)
-
-        # deep-translator can sometimes return None
-        if translated is None:
-            return text
-
-        return translated
+        return _translate(text)
 
     except Exception as e:
         logging.error(
             f"Translation failed for text: {text[:30]}... Error: {str(e)}"
         )
         return text  # Return original if translation fails
+
+
+def translate_to_english_batch(texts: list, max_workers: int = TRANSLATION_MAX_WORKERS) -> list:
+    """
+    Translate a list of non-English texts to English concurrently.
+
+    Cached translations are reused; each translation that is not cached is a
+    separate HTTP round-trip, so those requests are issued from a thread
+    pool. Results keep the order of the input list.
+    """
+    if not texts:
+        return []
+
+    keys = [_cache_key(text) for text in texts]
+    translations = _get_cached_translations(keys)
+
+    # Only send each distinct uncached text to the translator once
+    misses = {key: text for key, text in zip(keys, texts) if key not in translations}
+    if misses:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(misses))) as executor:
+            results = executor.map(_request_translation, misses.values())
+            fetched = {key: result for key, result in zip(misses, results) if result is not None}
+        _store_translations(fetched)
+        translations.update(fetched)
+
+    return [translations.get(key, text) for key, text in zip(keys, texts)]
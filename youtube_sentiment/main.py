@@ -1,81 +1,48 @@
 """
 Main application for YouTube Sentiment Analysis & Insights Chatbot
 """
-import os
-import sys
-import json
 from collections import Counter
+from itertools import islice
+import orjson
 
-# Handle both relative and absolute imports
-try:
-    # Try relative imports first (when running as module)
-    from .youtube_api import fetch_comments, fetch_all_comments
-    from .language_processor import detect_language, translate_to_english
-    from .sentiment_analyzer import analyze_sentiment, detect_toxicity
-    from .dashboard import create_dashboard
-    from .chatbot import initialize_chatbot, ask_question
-except ImportError:
-    # Fall back to absolute imports (when running as script)
-    try:
-        from youtube_sentiment.youtube_api import fetch_comments, fetch_all_comments
-        from youtube_sentiment.language_processor import detect_language, translate_to_english
-        from youtube_sentiment.sentiment_analyzer import analyze_sentiment, detect_toxicity
-        from youtube_sentiment.dashboard import create_dashboard
-        from youtube_sentiment.chatbot import initialize_chatbot, ask_question
-    except ImportError:
-        # Add the parent directory to sys.path and try again
-        parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        sys.path.insert(0, parent_dir)
-        from youtube_sentiment.youtube_api import fetch_comments, fetch_all_comments
-        from youtube_sentiment.language_processor import detect_language, translate_to_english
-        from youtube_sentiment.sentiment_analyzer import analyze_sentiment, detect_toxicity
-        from youtube_sentiment.dashboard import create_dashboard
-        from youtube_sentiment.chatbot import initialize_chatbot, ask_question
+from youtube_sentiment.youtube_api import fetch_comments, iter_all_comments
+from youtube_sentiment.language_processor import detect_language_batch, translate_to_english_batch
+from youtube_sentiment.sentiment_analyzer import analyze_sentiment_batch, detect_toxicity_batch
+from youtube_sentiment.dashboard import create_dashboard
+from youtube_sentiment.chatbot import initialize_chatbot, ask_question
 
-def process_comments(video_url, max_comments=None):
+# Number of comments fetched and analyzed together
+PROCESS_CHUNK_SIZE = 500
+
+def _process_comment_chunk(comments):
     """
-    Process YouTube comments through the full pipeline
+    Run a chunk of comments through language detection, translation,
+    sentiment analysis and toxicity detection
     
     Args:
-        video_url (str): YouTube video URL
-        max_comments (int, optional): Maximum number of comments to process. 
-                                     If None, fetches all comments.
+        comments (list): Comment dictionaries as returned by the YouTube API module
         
     Returns:
         list: Processed comments with all analysis results
     """
-    if max_comments is None:
-        print(f"Fetching ALL comments from: {video_url}")
-        comments = fetch_all_comments(video_url)
-    else:
-        print(f"Fetching comments from: {video_url} (max: {max_comments})")
-        comments = fetch_comments(video_url, max_comments)
+    texts = [comment['text'] for comment in comments]
     
-    print(f"Fetched {len(comments)} comments")
+    # Detect languages
+    languages = detect_language_batch(texts)
     
-    processed_comments = []
+    # Translate only the comments that are not English; translations run concurrently
+    translated_texts = list(texts)
+    to_translate = [i for i, lang in enumerate(languages) if lang not in ('en', 'unknown')]
+    for i, translated in zip(to_translate, translate_to_english_batch([texts[i] for i in to_translate])):
+        translated_texts[i] = translated
     
-    for i, comment in enumerate(comments):
-        if (i + 1) % 50 == 0 or i + 1 == len(comments):
-            print(f"Processing comment {i+1}/{len(comments)}")
-        
-        # Detect language
-        original_language = detect_language(comment['text'])
-        
-        # Translate if not English
-        if original_language != 'en':
-            translated_text = translate_to_english(comment['text'])
-        else:
-            translated_text = comment['text']
-        
-        # Perform sentiment analysis
-        sentiment_result = analyze_sentiment(translated_text)
-        
-        # Detect toxicity
-        is_toxic = detect_toxicity(translated_text)
-        
-        # Combine all results
-        processed_comment = {
+    # Perform sentiment analysis and toxicity detection over the whole chunk
+    sentiment_results = analyze_sentiment_batch(translated_texts)
+    toxicity_results = detect_toxicity_batch(translated_texts)
+    
+    # Combine all results
+    return [
+        {
             **comment,
             'original_language': original_language,
             'translated_text': translated_text,
@@ -83,9 +50,55 @@ def process_comments(video_url, max_comments=None):
             'polarity': sentiment_result['polarity'],
             'is_toxic': is_toxic
         }
+        for comment, original_language, translated_text, sentiment_result, is_toxic
+        in zip(comments, languages, translated_texts, sentiment_results, toxicity_results)
+    ]
+
+def iter_processed_comments(video_url, max_comments=None):
+    """
+    Lazily run YouTube comments through the full pipeline
+    
+    Comments are fetched and analyzed in chunks of PROCESS_CHUNK_SIZE, so the
+    raw comments of a large video are never all held in memory at once.
+    
+    Args:
+        video_url (str): YouTube video URL
+        max_comments (int, optional): Maximum number of comments to process. 
+                                     If None, fetches all comments.
         
-        processed_comments.append(processed_comment)
+    Yields:
+        dict: Processed comment with all analysis results
+    """
+    if max_comments is None:
+        print(f"Fetching ALL comments from: {video_url}")
+        comments = iter_all_comments(video_url)
+    else:
+        print(f"Fetching comments from: {video_url} (max: {max_comments})")
+        comments = iter(fetch_comments(video_url, max_comments))
     
+    processed_count = 0
+    while True:
+        chunk = list(islice(comments, PROCESS_CHUNK_SIZE))
+        if not chunk:
+            break
+        yield from _process_comment_chunk(chunk)
+        processed_count += len(chunk)
+        print(f"Processed {processed_count} comments so far...")
+
+def process_comments(video_url, max_comments=None):
+    """
+    Process YouTube comments through the full pipeline
+    
+    Args:
+        video_url (str): YouTube video URL
+        max_comments (int, optional): Maximum number of comments to process. 
+                                     If None, fetches all comments.
+        
+    Returns:
+        list: Processed comments with all analysis results
+    """
+    processed_comments = list(iter_processed_comments(video_url, max_comments))
+    print(f"Processed {len(processed_comments)} comments")
     return processed_comments
 
 def save_results(processed_comments, filename='results.json'):
@@ -96,15 +109,9 @@ def save_results(processed_comments, filename='results.json'):
         processed_comments (list): Processed comments
         filename (str): Output filename
     """
-    # Convert to JSON-serializable format
-    serializable_comments = []
-    for comment in processed_comments:
-        serializable_comment = comment.copy()
-        # Convert any non-serializable objects
-        serializable_comments.append(serializable_comment)
-    
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(serializable_comments, f, indent=2, ensure_ascii=False)
+    # orjson writes UTF-8 directly, so non-ASCII text is kept as-is
+    with open(filename, 'wb') as f:
+        f.write(orjson.dumps(processed_comments, option=orjson.OPT_INDENT_2))
     
     print(f"Results saved to {filename}")
 
@@ -118,30 +125,28 @@ def get_analysis_summary(processed_comments):
     Returns:
         dict: Summary statistics with sample comments
     """
-    sentiments = [comment['sentiment'] for comment in processed_comments]
-    languages = [comment['original_language'] for comment in processed_comments]
-    toxic_comments = [comment for comment in processed_comments if comment['is_toxic']]
-    
-    sentiment_distribution = dict(Counter(sentiments))
-    language_distribution = dict(Counter(languages))
-    
-    # Get sample comments for each sentiment
-    positive_comments = [c for c in processed_comments if c['sentiment'] == 'Positive'][:3]
-    negative_comments = [c for c in processed_comments if c['sentiment'] == 'Negative'][:3]
-    neutral_comments = [c for c in processed_comments if c['sentiment'] == 'Neutral'][:3]
-    
-    # Extract just the text for context
-    sample_comments = {
-        'positive': [c['text'][:100] + '...' if len(c['text']) > 100 else c['text'] for c in positive_comments],
-        'negative': [c['text'][:100] + '...' if len(c['text']) > 100 else c['text'] for c in negative_comments],
-        'neutral': [c['text'][:100] + '...' if len(c['text']) > 100 else c['text'] for c in neutral_comments]
-    }
+    sentiment_distribution = Counter()
+    language_distribution = Counter()
+    toxic_comments_count = 0
+    sample_comments = {'positive': [], 'negative': [], 'neutral': []}
+    
+    # Count and collect up to 3 sample texts per sentiment in a single pass
+    for comment in processed_comments:
+        sentiment = comment['sentiment']
+        sentiment_distribution[sentiment] += 1
+        language_distribution[comment['original_language']] += 1
+        if comment['is_toxic']:
+            toxic_comments_count += 1
+        samples = sample_comments[sentiment.lower()]
+        if len(samples) < 3:
+            text = comment['text']
+            samples.append(text[:100] + '...' if len(text) > 100 else text)
     
     return {
         'total_comments': len(processed_comments),
-        'sentiment_distribution': sentiment_distribution,
-        'language_distribution': language_distribution,
-        'toxic_comments_count': len(toxic_comments),
+        'sentiment_distribution': dict(sentiment_distribution),
+        'language_distribution': dict(language_distribution),
+        'toxic_comments_count': toxic_comments_count,
         'sample_comments': sample_comments
     }
 
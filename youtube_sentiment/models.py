@@ -35,6 +35,11 @@ class SearchHistory(db.Model):  # type: ignore[reportGeneralTypeIssues]
     language_distribution = db.Column(db.Text, nullable=False)   # type: ignore[reportAttributeAccessIssue]
     created_at = db.Column(db.DateTime, default=datetime.utcnow)  # type: ignore[reportAttributeAccessIssue]
     
+    # Serves the per-user history listing (newest first) from the index
+    __table_args__ = (
+        db.Index('ix_search_user_created', 'user_id', created_at.desc()),  # type: ignore[reportAttributeAccessIssue]
+    )
+    
     # Relationships
     comments = db.relationship('CommentAnalysis', backref='search', lazy=True, cascade='all, delete-orphan')  # type: ignore[reportAttributeAccessIssue]
 
@@ -52,6 +57,11 @@ class CommentAnalysis(db.Model):  # type: ignore[reportGeneralTypeIssues]
     polarity = db.Column(db.Float, nullable=False)  # type: ignore[reportAttributeAccessIssue]
     is_toxic = db.Column(db.Boolean, default=False)  # type: ignore[reportAttributeAccessIssue]
     created_at = db.Column(db.DateTime, default=datetime.utcnow)  # type: ignore[reportAttributeAccessIssue]
+    
+    # Serves loading a search's comments (and per-sentiment counts) without a table scan
+    __table_args__ = (
+        db.Index('ix_comment_search_sentiment', 'search_id', 'sentiment'),
+    )
 
     def __repr__(self):
         return f'<CommentAnalysis {self.comment_id}>'
@@ -1,10 +1,126 @@
 """
 Module for sentiment analysis and toxicity detection
 """
-from textblob import TextBlob
+from textblob.sentiments import PatternAnalyzer
 import re
+import threading
+from bisect import bisect_right
+from functools import lru_cache
 from typing import Any
 
+# Hyperscan scans for every toxicity keyword and pattern in a single pass when installed
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    hyperscan = None
+    HYPERSCAN_AVAILABLE = False
+
+# Basic keyword-based toxicity detection
+# In a real application, you might want to use a more sophisticated approach
+TOXICITY_KEYWORDS = [
+    'hate', 'kill', 'stupid', 'idiot', 'dumb', 'worthless', 'disgusting',
+    'disgust', 'shut up', 'shutup', 'shut your', 'go to hell', 'damn',
+    'retard', 'retarded', 'moron', 'moronic', 'crap', 'trash', 'garbage',
+    'useless', 'pathetic', 'awful', 'terrible', 'horrible', 'horrid'
+]
+
+# Pattern matches (for more flexible detection)
+TOXIC_PATTERNS = [
+    r'\byou\s+are\s+(a\s+)?(idiot|stupid|dumb|moron|retard)',
+    r'\bfuck\b',
+    r'\bshit\b',
+    r'\bdie\b',
+    r'\bkys\b'  # kill yourself
+]
+
+# Shared lexicon-based sentiment analyzer (TextBlob's default)
+_SENTIMENT_ANALYZER = PatternAnalyzer()
+
+# Fallback matcher: every keyword and pattern as one alternation, so each text is scanned once
+_TOXICITY_RE = re.compile(
+    '|'.join([re.escape(keyword) for keyword in TOXICITY_KEYWORDS] + [f'(?:{pattern})' for pattern in TOXIC_PATTERNS]),
+    re.IGNORECASE
+)
+
+def _compile_hyperscan_database(flags):
+    """Compile the keywords and patterns into one Hyperscan database"""
+    expressions = [re.escape(keyword).encode() for keyword in TOXICITY_KEYWORDS]
+    expressions += [pattern.encode() for pattern in TOXIC_PATTERNS]
+    database = hyperscan.Database()
+    database.compile(
+        expressions=expressions,
+        ids=list(range(len(expressions))),
+        elements=len(expressions),
+        flags=[flags] * len(expressions)
+    )
+    return database
+
+if HYPERSCAN_AVAILABLE:
+    # Single-text scans only need to know whether anything matched
+    _HS_DATABASE = _compile_hyperscan_database(hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH)
+    # Batch scans cover many texts at once, so every match must be reported
+    _HS_BATCH_DATABASE = _compile_hyperscan_database(hyperscan.HS_FLAG_CASELESS)
+else:
+    _HS_DATABASE = None
+    _HS_BATCH_DATABASE = None
+
+# Each database owns a single scratch space, so scans must not run concurrently
+_HS_LOCK = threading.Lock()
+
+def _stop_on_first_match(match_id, start, end, flags, context):
+    """Hyperscan match handler that records the match and halts the scan"""
+    context['matched'] = True
+    return True
+
+def _hyperscan_match(text):
+    """Return True if any toxicity keyword or pattern occurs in text"""
+    context = {'matched': False}
+    with _HS_LOCK:
+        _HS_DATABASE.scan(text.encode('utf-8'), match_event_handler=_stop_on_first_match, context=context)
+    return context['matched']
+
+def _hyperscan_match_batch(texts):
+    """Return a toxicity flag per text, scanning all of them in one Hyperscan call"""
+    if not texts:
+        return []
+    
+    # Scan every text in one call over a NUL-separated buffer. No keyword or
+    # pattern can match across a NUL, and the start offsets map each match
+    # back to the text it ended in.
+    encoded = [text.encode('utf-8') for text in texts]
+    offsets = []
+    position = 0
+    for data in encoded:
+        offsets.append(position)
+        position += len(data) + 1
+    
+    results = [False] * len(texts)
+    
+    def mark_match(match_id, start, end, flags, context):
+        results[bisect_right(offsets, end - 1) - 1] = True
+    
+    with _HS_LOCK:
+        _HS_BATCH_DATABASE.scan(b'\x00'.join(encoded), match_event_handler=mark_match)
+    return results
+
+def load_sentiment_lexicon():
+    """
+    Load TextBlob's sentiment lexicon now instead of on the first analysis
+    
+    The lexicon is parsed lazily, once per process. Loading it at startup keeps
+    that cost off the first request, and in a server that forks workers after
+    creating the app it lets the workers share the parent's copy.
+    """
+    _SENTIMENT_ANALYZER.analyze('good')
+
+@lru_cache(maxsize=100_000)
+def _score_polarity(text):
+    """Tokenize and score text with the shared lexicon analyzer, memoized across runs"""
+    # Same analyzer TextBlob(text).sentiment delegates to, without building a blob
+    sentiment_obj: Any = _SENTIMENT_ANALYZER.analyze(text)
+    return float(sentiment_obj.polarity) if hasattr(sentiment_obj, 'polarity') else 0.0
+
 def analyze_sentiment(text):
     """
     Perform sentiment analysis on text
@@ -16,10 +132,7 @@ def analyze_sentiment(text):
         dict: Dictionary containing sentiment label and polarity score
     """
     try:
-        blob = TextBlob(text)
-        # Access sentiment attribute properly
-        sentiment_obj: Any = blob.sentiment
-        polarity = float(sentiment_obj.polarity) if hasattr(sentiment_obj, 'polarity') else 0.0
+        polarity = _score_polarity(text)
         
         if polarity > 0.1:
             sentiment = 'Positive'
@@ -39,6 +152,20 @@ def analyze_sentiment(text):
             'polarity': 0.0
         }
 
+def analyze_sentiment_batch(texts):
+    """
+    Perform sentiment analysis on a list of texts
+    
+    Args:
+        texts (list): Texts to analyze
+        
+    Returns:
+        list: Sentiment result dictionaries, in the same order as texts
+    """
+    # Score each distinct text once and fan the result back out
+    scored = {text: analyze_sentiment(text) for text in dict.fromkeys(texts)}
+    return [scored[text] for text in texts]
+
 def detect_toxicity(text):
     """
     Simple toxicity/hate speech detection based on keywords
@@ -50,33 +177,26 @@ def detect_toxicity(text):
     Returns:
         bool: True if toxicity is detected, False otherwise
     """
-    # Basic keyword-based toxicity detection
-    # In a real application, you might want to use a more sophisticated approach
-    toxicity_keywords = [
-        'hate', 'kill', 'stupid', 'idiot', 'dumb', 'worthless', 'disgusting',
-        'disgust', 'shut up', 'shutup', 'shut your', 'go to hell', 'damn',
-        'retard', 'retarded', 'moron', 'moronic', 'crap', 'trash', 'garbage',
-        'useless', 'pathetic', 'awful', 'terrible', 'horrible', 'horrid'
-    ]
+    if _HS_DATABASE is not None:
+        return _hyperscan_match(text)
     
-    text_lower = text.lower()
-    
-    # Check for exact matches
-    for keyword in toxicity_keywords:
-        if keyword in text_lower:
-            return True
-    
-    # Check for pattern matches (for more flexible detection)
-    toxic_patterns = [
-        r'\byou\s+are\s+(a\s+)?(idiot|stupid|dumb|moron|retard)',
-        r'\bfuck\b',
-        r'\bshit\b',
-        r'\bdie\b',
-        r'\bkys\b'  # kill yourself
-    ]
+    return _TOXICITY_RE.search(text) is not None
+
+def detect_toxicity_batch(texts):
+    """
+    Run toxicity detection on a list of texts
     
-    for pattern in toxic_patterns:
-        if re.search(pattern, text_lower):
-            return True
-            
-    return False
\ No newline at end of file
+    Args:
+        texts (list): Texts to analyze
+        
+    Returns:
+        list: Toxicity flags, in the same order as texts
+    """
+    # Check each distinct text once and fan the result back out
+    unique_texts = list(dict.fromkeys(texts))
+    if _HS_BATCH_DATABASE is None:
+        flags = [detect_toxicity(text) for text in unique_texts]
+    else:
+        flags = _hyperscan_match_batch(unique_texts)
+    toxic = dict(zip(unique_texts, flags))
+    return [toxic[text] for text in texts]
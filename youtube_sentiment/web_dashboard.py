@@ -4,10 +4,11 @@ Web dashboard for YouTube Sentiment Analysis using Dash
 # Updated imports for relative paths
 try:
     import dash
-    from dash import dcc, html, Input, Output, callback, State
+    from dash import dcc, html, Input, Output, callback, State, Patch, no_update
     import plotly.express as px
     import pandas as pd
     from collections import Counter
+    import heapq
     import json
     import sys
     import os
@@ -22,23 +23,32 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 # Import from our package
 try:
     from .youtube_api import fetch_comments, fetch_all_comments
-    from .language_processor import detect_language, translate_to_english
-    from .sentiment_analyzer import analyze_sentiment, detect_toxicity
+    from .language_processor import detect_language_batch, translate_to_english_batch
+    from .sentiment_analyzer import analyze_sentiment_batch, detect_toxicity_batch, load_sentiment_lexicon
     from .chatbot import initialize_chatbot, ask_question
 except ImportError:
     # Fallback for direct execution
     from youtube_sentiment.youtube_api import fetch_comments, fetch_all_comments
-    from youtube_sentiment.language_processor import detect_language, translate_to_english
-    from youtube_sentiment.sentiment_analyzer import analyze_sentiment, detect_toxicity
+    from youtube_sentiment.language_processor import detect_language_batch, translate_to_english_batch
+    from youtube_sentiment.sentiment_analyzer import analyze_sentiment_batch, detect_toxicity_batch, load_sentiment_lexicon
     from youtube_sentiment.chatbot import initialize_chatbot, ask_question
 
 # Initialize Dash app
 app = dash.Dash(__name__, title="YouTube Sentiment Analysis")
 
-# Global variables
-processed_data = []
+# Parse the sentiment lexicon at start-up instead of during the first analysis
+load_sentiment_lexicon()
+
+# The chatbot model is the same for every session, so it is created once per process;
+# per-analysis state lives in the browser (dcc.Store) instead of module globals
 chatbot_model = None
-analysis_summary = {}
+
+def get_chatbot_model():
+    """Get the shared chatbot model, initializing it on first use"""
+    global chatbot_model
+    if chatbot_model is None:
+        chatbot_model = initialize_chatbot('models/gemini-flash-latest')
+    return chatbot_model
 
 def process_comments(video_url, max_comments=50, fetch_all=False):
     """
@@ -60,40 +70,47 @@ def process_comments(video_url, max_comments=50, fetch_all=False):
         comments = fetch_comments(video_url, max_comments)
     print(f"Fetched {len(comments)} comments")
     
-    processed_comments = []
-    
-    for i, comment in enumerate(comments):
-        if (i + 1) % 50 == 0 or i + 1 == len(comments):
-            print(f"Processing comment {i+1}/{len(comments)}")
-        
-        # Detect language
-        original_language = detect_language(comment['text'])
-        
-        # Translate if not English
-        if original_language != 'en':
-            translated_text = translate_to_english(comment['text'])
+    # Blank comments have nothing to analyze; give them the results the pipeline would
+    text_comments = []
+    for comment in comments:
+        text = comment['text']
+        if text and not text.isspace():
+            text_comments.append(comment)
         else:
-            translated_text = comment['text']
-        
-        # Perform sentiment analysis
-        sentiment_result = analyze_sentiment(translated_text)
-        
-        # Detect toxicity
-        is_toxic = detect_toxicity(translated_text)
-        
-        # Combine all results
-        processed_comment = {
-            **comment,
-            'original_language': original_language,
-            'translated_text': translated_text,
-            'sentiment': sentiment_result['sentiment'],
-            'polarity': sentiment_result['polarity'],
-            'is_toxic': is_toxic
-        }
-        
-        processed_comments.append(processed_comment)
+            comment['original_language'] = 'unknown'
+            comment['translated_text'] = text
+            comment['sentiment'] = 'Neutral'
+            comment['polarity'] = 0.0
+            comment['is_toxic'] = False
+    
+    texts = [comment['text'] for comment in text_comments]
+    
+    # Detect languages
+    print(f"Detecting languages for {len(texts)} comments")
+    languages = detect_language_batch(texts)
+    
+    # Translate only the comments that are not English; translations run concurrently
+    translated_texts = list(texts)
+    to_translate = [i for i, lang in enumerate(languages) if lang not in ('en', 'unknown')]
+    print(f"Translating {len(to_translate)} non-English comments")
+    for i, translated in zip(to_translate, translate_to_english_batch([texts[i] for i in to_translate])):
+        translated_texts[i] = translated
+    
+    # Perform sentiment analysis and toxicity detection over the whole batch
+    sentiment_results = analyze_sentiment_batch(translated_texts)
+    toxicity_results = detect_toxicity_batch(translated_texts)
+    
+    # Add the results to the fetched comment dicts in place instead of copying each one
+    for comment, original_language, translated_text, sentiment_result, is_toxic in zip(
+        text_comments, languages, translated_texts, sentiment_results, toxicity_results
+    ):
+        comment['original_language'] = original_language
+        comment['translated_text'] = translated_text
+        comment['sentiment'] = sentiment_result['sentiment']
+        comment['polarity'] = sentiment_result['polarity']
+        comment['is_toxic'] = is_toxic
     
-    return processed_comments
+    return comments
 
 def get_analysis_summary(processed_comments):
     """
@@ -105,30 +122,28 @@ def get_analysis_summary(processed_comments):
     Returns:
         dict: Summary statistics with sample comments
     """
-    sentiments = [comment['sentiment'] for comment in processed_comments]
-    languages = [comment['original_language'] for comment in processed_comments]
-    toxic_comments = [comment for comment in processed_comments if comment['is_toxic']]
+    sentiment_distribution = Counter()
+    language_distribution = Counter()
+    toxic_comments_count = 0
+    sample_comments = {'positive': [], 'negative': [], 'neutral': []}
     
-    sentiment_distribution = dict(Counter(sentiments))
-    language_distribution = dict(Counter(languages))
-    
-    # Get sample comments for each sentiment
-    positive_comments = [c for c in processed_comments if c['sentiment'] == 'Positive'][:3]
-    negative_comments = [c for c in processed_comments if c['sentiment'] == 'Negative'][:3]
-    neutral_comments = [c for c in processed_comments if c['sentiment'] == 'Neutral'][:3]
-    
-    # Extract just the text for context
-    sample_comments = {
-        'positive': [c['text'][:100] + '...' if len(c['text']) > 100 else c['text'] for c in positive_comments],
-        'negative': [c['text'][:100] + '...' if len(c['text']) > 100 else c['text'] for c in negative_comments],
-        'neutral': [c['text'][:100] + '...' if len(c['text']) > 100 else c['text'] for c in neutral_comments]
-    }
+    # Count and collect up to 3 sample texts per sentiment in a single pass
+    for comment in processed_comments:
+        sentiment = comment['sentiment']
+        sentiment_distribution[sentiment] += 1
+        language_distribution[comment['original_language']] += 1
+        if comment['is_toxic']:
+            toxic_comments_count += 1
+        samples = sample_comments[sentiment.lower()]
+        if len(samples) < 3:
+            text = comment['text']
+            samples.append(text[:100] + '...' if len(text) > 100 else text)
     
     return {
         'total_comments': len(processed_comments),
-        'sentiment_distribution': sentiment_distribution,
-        'language_distribution': language_distribution,
-        'toxic_comments_count': len(toxic_comments),
+        'sentiment_distribution': dict(sentiment_distribution),
+        'language_distribution': dict(language_distribution),
+        'toxic_comments_count': toxic_comments_count,
         'sample_comments': sample_comments
     }
 
@@ -280,7 +295,7 @@ def create_layout():
             html.Div([
                 html.H2("AI Chatbot", style={'textAlign': 'center', 'marginBottom': '20px'}),
                 html.Div([
-                    html.Div(id='chatbot-history', style={'height': '300px', 'overflowY': 'scroll', 'padding': '15px', 'backgroundColor': '#f8f9fa', 'borderRadius': '10px', 'marginBottom': '15px'}),
+                    html.Div(id='chatbot-history', children=[], style={'height': '300px', 'overflowY': 'scroll', 'padding': '15px', 'backgroundColor': '#f8f9fa', 'borderRadius': '10px', 'marginBottom': '15px'}),
                     html.Div([
                         dcc.Input(
                             id='chatbot-input',
@@ -297,7 +312,10 @@ def create_layout():
                     ], style={'display': 'flex'})
                 ], style={'padding': '20px', 'backgroundColor': '#ffffff', 'borderRadius': '10px', 'boxShadow': '0 4px 6px rgba(0,0,0,0.1)'})
             ], style={'marginTop': '20px'})
-        ], style={'display': 'none'})  # Hidden by default
+        ], style={'display': 'none'}),  # Hidden by default
+        
+        # Summary of the current analysis, used as chatbot context
+        dcc.Store(id='summary-store')
     ], style={'maxWidth': '1200px', 'margin': '0 auto', 'padding': '20px', 'fontFamily': 'Arial, sans-serif'})
 
 # Set the app layout
@@ -313,7 +331,8 @@ app.layout = create_layout()
      Output('sentiment-chart', 'figure'),
      Output('language-chart', 'figure'),
      Output('top-positive-comments', 'children'),
-     Output('top-negative-comments', 'children')],
+     Output('top-negative-comments', 'children'),
+     Output('summary-store', 'data')],
     [Input('analyze-button', 'n_clicks')],
     [State('video-url', 'value'),
      State('max-comments', 'value'),
@@ -321,10 +340,8 @@ app.layout = create_layout()
 )
 def update_dashboard(n_clicks, video_url, max_comments, fetch_all_value):
     """Update dashboard with analysis results"""
-    global processed_data, analysis_summary, chatbot_model
-    
     if n_clicks == 0 or not video_url:
-        return ["", {'display': 'none'}, "0", "0", "0", "0", {}, {}, "", ""]
+        return ["", {'display': 'none'}, "0", "0", "0", "0", {}, {}, "", "", None]
     
     try:
         # Show loading message
@@ -342,13 +359,9 @@ def update_dashboard(n_clicks, video_url, max_comments, fetch_all_value):
         # Get analysis summary
         analysis_summary = get_analysis_summary(processed_data)
         
-        # Initialize chatbot model
-        chatbot_model = initialize_chatbot('models/gemini-flash-latest')
-        
         # Calculate summary statistics
         total_comments = analysis_summary['total_comments']
-        sentiments = [comment['sentiment'] for comment in processed_data]
-        sentiment_counts = Counter(sentiments)
+        sentiment_counts = analysis_summary['sentiment_distribution']
         
         positive_count = sentiment_counts.get('Positive', 0)
         negative_count = sentiment_counts.get('Negative', 0)
@@ -362,8 +375,7 @@ def update_dashboard(n_clicks, video_url, max_comments, fetch_all_value):
             color_discrete_sequence=['green', 'red', 'orange']
         )
         
-        languages = [comment['original_language'] for comment in processed_data]
-        language_counts = Counter(languages)
+        language_counts = analysis_summary['language_distribution']
         language_fig = px.bar(
             x=list(language_counts.keys()),
             y=list(language_counts.values()),
@@ -373,12 +385,13 @@ def update_dashboard(n_clicks, video_url, max_comments, fetch_all_value):
             color_continuous_scale='Blues'
         )
         
-        # Get top comments
-        positive_comments = [c for c in processed_data if c['sentiment'] == 'Positive']
-        negative_comments = [c for c in processed_data if c['sentiment'] == 'Negative']
-        
-        top_positive = sorted(positive_comments, key=lambda x: x['polarity'], reverse=True)[:3]
-        top_negative = sorted(negative_comments, key=lambda x: x['polarity'])[:3]
+        # Get top comments without sorting every positive/negative comment
+        top_positive = heapq.nlargest(
+            3, (c for c in processed_data if c['sentiment'] == 'Positive'), key=lambda x: x['polarity']
+        )
+        top_negative = heapq.nsmallest(
+            3, (c for c in processed_data if c['sentiment'] == 'Negative'), key=lambda x: x['polarity']
+        )
         
         # Format top comments for display
         top_positive_html = html.Ul([
@@ -396,32 +409,27 @@ def update_dashboard(n_clicks, video_url, max_comments, fetch_all_value):
         ])
         
         # Hide loading message and show results
-        return ["", {'display': 'block'}, str(total_comments), str(positive_count), str(negative_count), str(neutral_count), sentiment_fig, language_fig, top_positive_html, top_negative_html]
+        return ["", {'display': 'block'}, str(total_comments), str(positive_count), str(negative_count), str(neutral_count), sentiment_fig, language_fig, top_positive_html, top_negative_html, analysis_summary]
         
     except Exception as e:
         error_message = html.Div([
             html.H3("Error occurred during analysis", style={'color': 'red'}),
             html.P(f"Error: {str(e)}")
         ])
-        return [error_message, {'display': 'none'}, "0", "0", "0", "0", {}, {}, "", ""]
+        return [error_message, {'display': 'none'}, "0", "0", "0", "0", {}, {}, "", "", None]
 
 @app.callback(
     Output('chatbot-history', 'children'),
     [Input('chatbot-send', 'n_clicks')],
     [State('chatbot-input', 'value'),
-     State('chatbot-history', 'children')]
+     State('summary-store', 'data')],
+    prevent_initial_call=True
 )
-def update_chatbot(n_clicks, user_input, chat_history):
+def update_chatbot(n_clicks, user_input, analysis_summary):
     """Update chatbot conversation"""
-    global chatbot_model, analysis_summary
-    
-    # Initialize chat history if None
-    if chat_history is None:
-        chat_history = []
-    
-    # If this is the first click or no input, return current history
+    # If this is the first click or no input, keep the current history
     if n_clicks == 0 or not user_input:
-        return chat_history
+        return no_update
     
     # Add user message to history
     user_message = html.Div([
@@ -429,16 +437,11 @@ def update_chatbot(n_clicks, user_input, chat_history):
         user_input
     ], style={'marginBottom': '10px', 'padding': '10px', 'backgroundColor': '#e9ecef', 'borderRadius': '5px'})
     
-    # Add user message to history
-    if isinstance(chat_history, list):
-        new_history = chat_history + [user_message]
-    else:
-        new_history = [user_message]
-    
     # Get chatbot response
-    if chatbot_model:
+    model = get_chatbot_model()
+    if model:
         try:
-            response = ask_question(chatbot_model, user_input, analysis_summary)
+            response = ask_question(model, user_input, analysis_summary)
             bot_message = html.Div([
                 html.Strong("Bot: ", style={'color': '#28a745'}),
                 response
@@ -454,8 +457,10 @@ def update_chatbot(n_clicks, user_input, chat_history):
             "Chatbot is not available. Please check your API configuration."
         ], style={'marginBottom': '10px', 'padding': '10px', 'backgroundColor': '#f8f9fa', 'borderRadius': '5px'})
     
-    # Add bot message to history
-    new_history = new_history + [bot_message]
+    # Append both messages to the history in the browser instead of resending all of it
+    new_history = Patch()
+    new_history.append(user_message)
+    new_history.append(bot_message)
     
     return new_history
 
@@ -2,8 +2,11 @@
 Module for fetching YouTube comments using YouTube Data API v3
 """
 import os
+import queue
 import re
 import sys
+import threading
+from functools import lru_cache
 
 # Add the parent directory to the path to allow imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -22,7 +25,64 @@ except ImportError:
         YOUTUBE_API_KEY = os.getenv('YOUTUBE_API_KEY', '')
         MAX_COMMENTS = int(os.getenv('MAX_COMMENTS', 100))
 
+import httplib2
+import orjson
 from googleapiclient.discovery import build
+from googleapiclient.model import JsonModel
+
+# Retries (with exponential backoff) for transient API errors such as 5xx and rate limits
+API_NUM_RETRIES = 3
+
+# Number of comment pages fetched ahead while earlier pages are being processed
+PREFETCH_PAGES = 4
+
+# Only request the fields we read from each comment thread page
+_COMMENT_THREAD_FIELDS = (
+    'nextPageToken,'
+    'items(id,snippet/topLevelComment/snippet(authorDisplayName,textDisplay,publishedAt,likeCount,updatedAt))'
+)
+
+# Queue marker for the end of the page stream
+_PAGES_DONE = object()
+
+# Handle different YouTube URL formats
+_VIDEO_ID_PATTERNS = [
+    re.compile(r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/)([a-zA-Z0-9_-]{11})'),
+    re.compile(r'youtube\.com\/watch\?.*v=([a-zA-Z0-9_-]{11})'),
+    re.compile(r'youtu\.be\/([a-zA-Z0-9_-]{11})'),
+    re.compile(r'youtube\.com\/embed\/([a-zA-Z0-9_-]{11})')
+]
+_VIDEO_ID_RE = re.compile(r'^[a-zA-Z0-9_-]+$')
+
+class ORJSONModel(JsonModel):
+    """googleapiclient JSON model that decodes response bodies with orjson"""
+    
+    def deserialize(self, content):
+        try:
+            body = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # Same fallback as JsonModel: hand back the raw text
+            return content.decode('utf-8') if isinstance(content, bytes) else content
+        if self._data_wrapper and isinstance(body, dict) and 'data' in body:
+            body = body['data']
+        return body
+
+@lru_cache(maxsize=None)
+def _get_youtube_client():
+    """
+    Build the YouTube Data API client once and reuse it across calls
+    
+    The client is built from the discovery document shipped with
+    googleapiclient, so no discovery request is made, and decodes
+    responses with orjson.
+    """
+    return build(
+        'youtube', 'v3',
+        developerKey=YOUTUBE_API_KEY,
+        model=ORJSONModel(),
+        static_discovery=True,
+        cache_discovery=False
+    )
 
 def get_video_id(url):
     """
@@ -37,17 +97,9 @@ def get_video_id(url):
     if not url:
         return None
         
-    # Handle different YouTube URL formats
-    patterns = [
-        r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/)([a-zA-Z0-9_-]{11})',
-        r'youtube\.com\/watch\?.*v=([a-zA-Z0-9_-]{11})',
-        r'youtu\.be\/([a-zA-Z0-9_-]{11})',
-        r'youtube\.com\/embed\/([a-zA-Z0-9_-]{11})'
-    ]
-    
-    # Try each pattern
-    for pattern in patterns:
-        match = re.search(pattern, url)
+    # Try each supported URL format
+    for pattern in _VIDEO_ID_PATTERNS:
+        match = pattern.search(url)
         if match:
             return match.group(1)
     
@@ -60,52 +112,46 @@ def get_video_id(url):
             end = len(url)
         video_id = url[start:end]
         # Validate video ID length (should be 11 characters)
-        if len(video_id) == 11 and re.match(r'^[a-zA-Z0-9_-]+$', video_id):
+        if len(video_id) == 11 and _VIDEO_ID_RE.match(video_id):
             return video_id
     
     return None
 
-def fetch_all_comments(video_url):
+def _iter_comment_pages(video_id):
     """
-    Fetch all comments from a YouTube video
+    Fetch all comment pages of a YouTube video, one request at a time
     
     Args:
-        video_url (str): YouTube video URL
+        video_id (str): YouTube video ID
         
-    Returns:
-        list: List of all comments with metadata
+    Yields:
+        list: Comments with metadata from one page
     """
-    video_id = get_video_id(video_url)
-    if not video_id:
-        raise ValueError("Invalid YouTube URL or unable to extract video ID")
-    
-    if not YOUTUBE_API_KEY:
-        raise ValueError("YouTube API key not found. Please set YOUTUBE_API_KEY in .env file")
-    
-    youtube = build('youtube', 'v3', developerKey=YOUTUBE_API_KEY)
+    youtube = _get_youtube_client()
+    # httplib2 connections are not thread-safe, so each paging loop uses its own
+    http = httplib2.Http()
     
-    comments = []
     next_page_token = None
     
-    print("Fetching all comments (this may take a while)...")
-    
     while True:
         request = youtube.commentThreads().list(
             part='snippet',
             videoId=video_id,
             maxResults=100,  # Maximum allowed per request
             order='relevance',
-            pageToken=next_page_token
+            pageToken=next_page_token,
+            fields=_COMMENT_THREAD_FIELDS
         )
         
         try:
-            response = request.execute()
+            response = request.execute(http=http, num_retries=API_NUM_RETRIES)
         except Exception as e:
             raise Exception(f"Error fetching comments: {str(e)}")
         
+        page = []
         for item in response['items']:
             comment = item['snippet']['topLevelComment']['snippet']
-            comments.append({
+            page.append({
                 'id': item['id'],
                 'author': comment['authorDisplayName'],
                 'text': comment['textDisplay'],
@@ -113,13 +159,88 @@ def fetch_all_comments(video_url):
                 'like_count': comment['likeCount'],
                 'updated_at': comment['updatedAt']
             })
+        yield page
         
         next_page_token = response.get('nextPageToken')
-        print(f"Fetched {len(comments)} comments so far...")
         
         # If there's no next page token, we've got all comments
         if not next_page_token:
             break
+
+def iter_all_comments(video_url, prefetch_pages=PREFETCH_PAGES):
+    """
+    Lazily fetch all comments from a YouTube video, one page at a time
+    
+    Each page needs the token returned with the previous one, so pages cannot
+    be requested in parallel. Instead a background thread keeps fetching up to
+    prefetch_pages pages ahead while the caller processes earlier comments.
+    
+    Args:
+        video_url (str): YouTube video URL
+        prefetch_pages (int): Maximum number of pages fetched ahead of the caller
+        
+    Yields:
+        dict: Comment with metadata
+    """
+    video_id = get_video_id(video_url)
+    if not video_id:
+        raise ValueError("Invalid YouTube URL or unable to extract video ID")
+    
+    if not YOUTUBE_API_KEY:
+        raise ValueError("YouTube API key not found. Please set YOUTUBE_API_KEY in .env file")
+    
+    pages = queue.Queue(maxsize=max(1, prefetch_pages))
+    stopped = threading.Event()
+    
+    def put(item):
+        # Give up once the caller has stopped consuming, instead of blocking forever
+        while not stopped.is_set():
+            try:
+                pages.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def produce():
+        try:
+            for page in _iter_comment_pages(video_id):
+                if not put((page, None)):
+                    return
+            put((_PAGES_DONE, None))
+        except Exception as e:
+            put((_PAGES_DONE, e))
+    
+    threading.Thread(target=produce, daemon=True).start()
+    try:
+        while True:
+            page, error = pages.get()
+            if page is _PAGES_DONE:
+                if error is not None:
+                    raise error
+                return
+            yield from page
+    finally:
+        stopped.set()
+
+def fetch_all_comments(video_url):
+    """
+    Fetch all comments from a YouTube video
+    
+    Args:
+        video_url (str): YouTube video URL
+        
+    Returns:
+        list: List of all comments with metadata
+    """
+    comments = []
+    
+    print("Fetching all comments (this may take a while)...")
+    
+    for comment in iter_all_comments(video_url):
+        comments.append(comment)
+        if len(comments) % 100 == 0:
+            print(f"Fetched {len(comments)} comments so far...")
     
     print(f"Finished fetching. Total comments: {len(comments)}")
     return comments
@@ -142,7 +263,9 @@ def fetch_comments(video_url, max_results=MAX_COMMENTS):
     if not YOUTUBE_API_KEY:
         raise ValueError("YouTube API key not found. Please set YOUTUBE_API_KEY in .env file")
     
-    youtube = build('youtube', 'v3', developerKey=YOUTUBE_API_KEY)
+    youtube = _get_youtube_client()
+    # httplib2 connections are not thread-safe, so each paging loop uses its own
+    http = httplib2.Http()
     
     comments = []
     next_page_token = None
@@ -153,11 +276,12 @@ def fetch_comments(video_url, max_results=MAX_COMMENTS):
             videoId=video_id,
             maxResults=min(100, max_results - len(comments)),
             order='relevance',
-            pageToken=next_page_token
+            pageToken=next_page_token,
+            fields=_COMMENT_THREAD_FIELDS
         )
         
         try:
-            response = request.execute()
+            response = request.execute(http=http, num_retries=API_NUM_RETRIES)
         except Exception as e:
             raise Exception(f"Error fetching comments: {str(e)}")
         